@@ -9,22 +9,41 @@ Advanced Tkinter File Organizer with:
 """
 
 import os
+import errno
+import hashlib
 import shutil
 import threading
-import queue
+from collections import deque
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext
 
+from file_organizer_hot import categorize_file, get_unique_name
+
+try:
+    from blake3 import blake3 as _new_hasher
+except ImportError:  # blake3 is optional; blake2b is the fastest stdlib fallback
+    _new_hasher = hashlib.blake2b
+
 # ---------------- Configuration ----------------
 FILE_TYPES = {
-    "Images": [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".svg", ".webp"],
-    "Documents": [".pdf", ".docx", ".doc", ".txt", ".pptx", ".ppt", ".xlsx", ".xls", ".odt", ".rtf"],
-    "Videos": [".mp4", ".mov", ".avi", ".mkv", ".wmv"],
-    "Music": [".mp3", ".wav", ".aac", ".flac", ".ogg"],
-    "Archives": [".zip", ".rar", ".7z", ".tar", ".gz"],
+    "Images": (".jpg", ".jpeg", ".png", ".gif", ".bmp", ".svg", ".webp"),
+    "Documents": (".pdf", ".docx", ".doc", ".txt", ".pptx", ".ppt", ".xlsx", ".xls", ".odt", ".rtf"),
+    "Videos": (".mp4", ".mov", ".avi", ".mkv", ".wmv"),
+    "Music": (".mp3", ".wav", ".aac", ".flac", ".ogg"),
+    "Archives": (".zip", ".rar", ".7z", ".tar", ".gz"),
 }
 OTHER_FOLDER_NAME = "Others"
+# Upper-case variants let ".JPG" etc. hit the table without lowercasing.
+EXT_TO_CAT = {variant: cat for cat, exts in FILE_TYPES.items()
+              for ext in exts for variant in (ext, ext.upper())}
+PROGRESS_STEPS = 200        # max progress messages per run
+LOG_FLUSH_COUNT = 50        # flush buffered log lines after this many...
+LOG_FLUSH_INTERVAL = 0.05   # ...or after this many seconds
+LOG_MAX_LINES = 2000        # terminal scrollback kept in the GUI
+MOVE_WORKERS = 8            # concurrent copies for cross-device moves
+HASH_CHUNK_SIZE = 1 << 20   # read size when hashing for duplicate detection
 
 COLORS = {
     "dark": {
@@ -44,30 +63,128 @@ COLORS = {
 }
 
 # ---------------- Utilities ----------------
-def get_unique_name(dest_dir, filename):
-    base, ext = os.path.splitext(filename)
-    candidate = filename
-    counter = 1
-    while os.path.exists(os.path.join(dest_dir, candidate)):
-        candidate = f"{base} ({counter}){ext}"
-        counter += 1
-    return candidate
-
-def categorize_file(filename):
-    lower = filename.lower()
-    for cat, exts in FILE_TYPES.items():
-        if lower.endswith(tuple(exts)):
-            return cat
-    return None
+def list_names(folder):
+    with os.scandir(folder) as it:
+        return {e.name.casefold() for e in it}
+
+def rename_no_replace(src, dst, src_dir_fd=None, dst_dir_fd=None):
+    """Rename src to dst, raising FileExistsError rather than replacing dst."""
+    if os.name == "nt":
+        # Windows rename already refuses to replace an existing file.
+        os.rename(src, dst)
+        return
+    try:
+        # link() fails with EEXIST when dst exists, so check and move are one step.
+        os.link(src, dst, src_dir_fd=src_dir_fd, dst_dir_fd=dst_dir_fd)
+    except FileExistsError:
+        raise
+    except OSError:
+        # No hard links on this filesystem (FAT, some network mounts): check, then rename.
+        try:
+            os.stat(dst, dir_fd=dst_dir_fd, follow_symlinks=False)
+        except FileNotFoundError:
+            os.rename(src, dst, src_dir_fd=src_dir_fd, dst_dir_fd=dst_dir_fd)
+            return
+        raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), dst)
+    os.unlink(src, dir_fd=src_dir_fd)
+
+def _check_copied(copied, size):
+    # Some kernel/filesystem pairs report "nothing copied" instead of an error;
+    # a 0 before any data means unsupported, anything else short is a failure.
+    if copied == 0 and size:
+        raise OSError(errno.EOPNOTSUPP, "no data copied")
+    if copied < size:
+        raise OSError(errno.EIO, f"short copy: {copied} of {size} bytes")
+
+def _copy_file_range(in_fd, out_fd, size):
+    copied = 0
+    while copied < size:
+        n = os.copy_file_range(in_fd, out_fd, size - copied)
+        if n == 0:
+            break
+        copied += n
+    _check_copied(copied, size)
+
+def _sendfile(in_fd, out_fd, size):
+    offset = 0
+    while offset < size:
+        n = os.sendfile(out_fd, in_fd, offset, size - offset)
+        if n == 0:
+            break
+        offset += n
+    _check_copied(offset, size)
+
+# copy_file_range first: on CoW filesystems (btrfs, XFS reflink, ZFS) it clones
+# extents instead of copying data.
+KERNEL_COPIERS = {name: f for name, f in (("copy_file_range", _copy_file_range), ("sendfile", _sendfile))
+                  if hasattr(os, name)}
+# ENOTSOCK: macOS sendfile only writes to sockets.
+_UNSUPPORTED_COPY_ERRNOS = {errno.EXDEV, errno.EOPNOTSUPP, errno.ENOSYS, errno.EINVAL, errno.ENOTSOCK}
+
+def _fast_copy(src, dst, copiers):
+    """Copy src to dst in-kernel when the OS allows it, falling back to a buffered copy.
+
+    Copiers that report the operation as unsupported are dropped from
+    ``copiers`` so later files go straight to the next method.
+    """
+    with open(src, "rb") as fsrc, open(dst, "xb") as fdst:
+        in_fd, out_fd = fsrc.fileno(), fdst.fileno()
+        size = os.fstat(in_fd).st_size
+        for name, copier in tuple(copiers.items()):
+            try:
+                copier(in_fd, out_fd, size)
+                break
+            except OSError as e:
+                if e.errno in _UNSUPPORTED_COPY_ERRNOS:
+                    copiers.pop(name, None)
+                # Rewind and try the next method.
+                os.lseek(in_fd, 0, os.SEEK_SET)
+                os.lseek(out_fd, 0, os.SEEK_SET)
+                os.ftruncate(out_fd, 0)
+        else:
+            shutil.copyfileobj(fsrc, fdst)
+    shutil.copystat(src, dst)
+
+def move_across_devices(src, dst, copiers):
+    try:
+        _fast_copy(src, dst, copiers)
+        # Never drop the source unless the copy is provably complete.
+        if os.path.getsize(dst) != os.path.getsize(src):
+            raise OSError(errno.EIO, f"copy of {src} is incomplete")
+    except FileExistsError:
+        # dst was already there and isn't ours to clean up.
+        raise
+    except BaseException:
+        if os.path.exists(dst):
+            os.unlink(dst)
+        raise
+    os.unlink(src)
+
+def file_digest(path, stopped=None):
+    """Hash the file's contents; returns None if ``stopped()`` turns true mid-file."""
+    hasher = _new_hasher()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            if stopped is not None and stopped():
+                return None
+            hasher.update(chunk)
+    return hasher.digest()
 
 # ---------------- Worker ----------------
 class OrganizerWorker(threading.Thread):
-    def __init__(self, source, dest, queue_out):
+    def __init__(self, source, dest, queue_out, queue_event, dedupe=False):
         super().__init__()
         self.source = source
         self.dest = dest
         self.queue_out = queue_out
+        self.queue_event = queue_event
+        self.dedupe = dedupe
+        self._duplicates = {}
+        self._dir_fds = None
         self._stop_event = threading.Event()
+        self._log_buffer = []
+        self._last_flush = time.monotonic()
+        self._last_progress = 0
 
     def stop(self):
         self._stop_event.set()
@@ -75,65 +192,232 @@ class OrganizerWorker(threading.Thread):
     def stopped(self):
         return self._stop_event.is_set()
 
+    def _post(self, item):
+        # deque.append is atomic, so the GUI can drain it without a lock.
+        self.queue_out.append(item)
+        self.queue_event.set()
+
+    def _log(self, msg):
+        self._log_buffer.append(msg)
+        if (len(self._log_buffer) >= LOG_FLUSH_COUNT
+                or time.monotonic() - self._last_flush >= LOG_FLUSH_INTERVAL):
+            self._flush_log()
+
+    def _flush_log(self):
+        if self._log_buffer:
+            self._post(("log", "\n".join(self._log_buffer)))
+            self._log_buffer = []
+        self._last_flush = time.monotonic()
+
+    def _progress(self, idx, total):
+        if idx - self._last_progress >= max(1, total // PROGRESS_STEPS) or idx == total:
+            self._flush_log()
+            self._post(("progress", idx))
+            self._last_progress = idx
+
+    def _find_duplicates(self, files):
+        """Map each duplicate file name to the earlier file it duplicates.
+
+        Files are grouped by size first (from the cached scandir stat), so only
+        files that share a size with another file are ever hashed.
+        """
+        by_size = {}
+        for entry in files:
+            try:
+                size = entry.stat().st_size
+            except OSError:
+                continue
+            if size:
+                by_size.setdefault(size, []).append(entry)
+
+        groups = [group for group in by_size.values() if len(group) > 1]
+        to_hash = sum(len(group) for group in groups)
+        duplicates = {}
+        if not to_hash:
+            return duplicates
+        self._log(f"[SYS] Checking {to_hash} same-size files for duplicates...")
+        self._flush_log()
+        self._post(("start", to_hash))
+        hashed = 0
+        for group in groups:
+            seen = {}
+            for entry in group:
+                try:
+                    digest = file_digest(entry.path, self.stopped)
+                except OSError:
+                    digest = None
+                if self.stopped():
+                    return duplicates
+                hashed += 1
+                self._progress(hashed, to_hash)
+                if digest is None:
+                    continue
+                original = seen.setdefault(digest, entry.name)
+                if original != entry.name:
+                    duplicates[entry.name] = original
+        return duplicates
+
+    def _move_one(self, entry, same_fs):
+        """Move a single file; returns (moved, log message). Safe to call from pool threads.
+
+        Once the worker is stopped this is a no-op returning (False, None), so
+        tasks still queued in the pool don't move anything.
+        """
+        if self.stopped():
+            return False, None
+        filename = entry.name
+        src_path = entry.path
+        try:
+            original = self._duplicates.get(filename)
+            if original:
+                return False, f"[SYS] Skipping duplicate: {filename} (duplicate of {original})"
+
+            category = categorize_file(filename, EXT_TO_CAT) or OTHER_FOLDER_NAME
+            dest_folder = self._cat_paths[category]
+
+            with self._name_locks[category]:
+                unique_name = get_unique_name(self._dest_names[category], filename)
+            while True:
+                dest_path = dest_folder + os.sep + unique_name
+                try:
+                    if self._dir_fds:
+                        src_fd, cat_fds = self._dir_fds
+                        rename_no_replace(filename, unique_name, src_dir_fd=src_fd, dst_dir_fd=cat_fds[category])
+                    elif same_fs:
+                        rename_no_replace(src_path, dest_path)
+                    else:
+                        move_across_devices(src_path, dest_path, self._copiers)
+                    break
+                except FileExistsError:
+                    # Created after the initial scan; take the next free name.
+                    with self._name_locks[category]:
+                        unique_name = get_unique_name(self._dest_names[category], filename)
+            timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+            return True, f"[SYS] [{timestamp}] Moved: {filename} → {category}/{unique_name}"
+        except Exception as e:
+            return False, f"[SYS] ERROR moving {filename}: {e}"
+
+    def _open_dir_fds(self):
+        """Open the source and category folders so renames resolve a single path component.
+
+        Returns (source fd, {category: fd}), or None where dir_fd renames are unsupported.
+        """
+        # rename_no_replace needs dir_fd support for all of these, not just rename.
+        if not {os.link, os.unlink, os.stat, os.rename} <= os.supports_dir_fd or not hasattr(os, "O_DIRECTORY"):
+            return None
+        flags = os.O_RDONLY | os.O_DIRECTORY
+        opened = []
+        try:
+            opened.append(os.open(self.source, flags))
+            cat_fds = {}
+            for cat, path in self._cat_paths.items():
+                cat_fds[cat] = os.open(path, flags)
+                opened.append(cat_fds[cat])
+        except OSError:
+            for fd in opened:
+                os.close(fd)
+            return None
+        return opened[0], cat_fds
+
+    def _close_dir_fds(self):
+        if self._dir_fds:
+            src_fd, cat_fds = self._dir_fds
+            for fd in (src_fd, *cat_fds.values()):
+                os.close(fd)
+            self._dir_fds = None
+
     def run(self):
         try:
-            files = [f for f in os.listdir(self.source) if os.path.isfile(os.path.join(self.source, f))]
+            with os.scandir(self.source) as it:
+                files = [e for e in it if e.is_file(follow_symlinks=False)]
         except Exception as e:
-            self.queue_out.put(("error", f"Failed to list source folder: {e}"))
+            self._post(("error", f"Failed to list source folder: {e}"))
             return
 
         total = len(files)
         moved_count = 0
-        self.queue_out.put(("start", total))
 
-        for cat in FILE_TYPES.keys():
-            os.makedirs(os.path.join(self.dest, cat), exist_ok=True)
-        os.makedirs(os.path.join(self.dest, OTHER_FOLDER_NAME), exist_ok=True)
-
-        for idx, filename in enumerate(files, start=1):
+        try:
+            self._cat_paths = {cat: os.path.join(self.dest, cat)
+                               for cat in (*FILE_TYPES.keys(), OTHER_FOLDER_NAME)}
+            for path in self._cat_paths.values():
+                os.makedirs(path, exist_ok=True)
+            self._dest_names = {cat: list_names(path) for cat, path in self._cat_paths.items()}
+            # os.stat, not DirEntry.stat(): the latter reports st_dev == 0 on Windows.
+            same_fs = os.stat(self.source).st_dev == os.stat(self.dest).st_dev
+        except OSError as e:
+            self._post(("error", f"Failed to prepare destination folder: {e}"))
+            return
+        self._name_locks = {cat: threading.Lock() for cat in self._dest_names}
+        # Per-run copy so an unsupported method is only probed once per source/dest pair.
+        self._copiers = dict(KERNEL_COPIERS)
+        if self.dedupe:
+            self._duplicates = self._find_duplicates(files)
             if self.stopped():
-                self.queue_out.put(("log", f"[SYS] Operation cancelled by user."))
-                break
-            src_path = os.path.join(self.source, filename)
+                self._log("[SYS] Operation cancelled by user.")
+                self._flush_log()
+                self._post(("done", 0))
+                return
+        self._last_progress = 0
+        self._post(("start", total))
+
+        if same_fs:
+            # Renames are metadata-only, so a serial loop is already fast.
+            self._dir_fds = self._open_dir_fds()
             try:
-                if not os.path.isfile(src_path):
-                    self.queue_out.put(("log", f"[SYS] Skipping (not a file): {filename}"))
-                    self.queue_out.put(("progress", idx))
-                    continue
-
-                category = categorize_file(filename) or OTHER_FOLDER_NAME
-                dest_folder = os.path.join(self.dest, category)
-                os.makedirs(dest_folder, exist_ok=True)
-
-                unique_name = get_unique_name(dest_folder, filename)
-                dest_path = os.path.join(dest_folder, unique_name)
-                shutil.move(src_path, dest_path)
-                moved_count += 1
-                timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-                self.queue_out.put(("log", f"[SYS] [{timestamp}] Moved: {filename} → {category}/{unique_name}"))
-            except Exception as e:
-                self.queue_out.put(("log", f"[SYS] ERROR moving {filename}: {e}"))
-
-            self.queue_out.put(("progress", idx))
-
-        self.queue_out.put(("done", moved_count))
+                for idx, entry in enumerate(files, start=1):
+                    if self.stopped():
+                        self._log("[SYS] Operation cancelled by user.")
+                        break
+                    moved, msg = self._move_one(entry, same_fs)
+                    moved_count += moved
+                    if msg:
+                        self._log(msg)
+                    self._progress(idx, total)
+            finally:
+                self._close_dir_fds()
+        else:
+            # Cross-device moves copy file data; overlap them in a pool.
+            with ThreadPoolExecutor(max_workers=MOVE_WORKERS) as pool:
+                futures = [pool.submit(self._move_one, entry, same_fs) for entry in files]
+                cancelled = False
+                idx = 0
+                for future in as_completed(futures):
+                    if future.cancelled():
+                        continue
+                    moved, msg = future.result()
+                    moved_count += moved
+                    idx += 1
+                    if msg:
+                        self._log(msg)
+                    self._progress(idx, total)
+                    if self.stopped() and not cancelled:
+                        cancelled = True
+                        for f in futures:
+                            f.cancel()
+                        self._log("[SYS] Operation cancelled by user.")
+
+        self._flush_log()
+        self._post(("done", moved_count))
 
 # ---------------- GUI ----------------
 class FileOrganizerGUI:
     def __init__(self, root):
         self.root = root
-        self.queue = queue.Queue()
+        self.queue = deque()
+        self.queue_event = threading.Event()
         self.worker = None
 
         self.source_var = tk.StringVar()
         self.dest_var = tk.StringVar()
+        self.dedupe_var = tk.BooleanVar(value=False)
 
         self._setup_window()
         self._build_ui()
         self.gradient_index = 0
         self._animate_terminal_cursor()
         self._animate_progress_gradient()
-        self.root.after(100, self._process_queue)
+        self._polling = False
 
     def _setup_window(self):
         self.root.title("File Organizer")
@@ -167,6 +451,11 @@ class FileOrganizerGUI:
         self.dest_entry.pack(side="left", fill="x", expand=True)
         self._styled_button(dst_frame, "Browse", self._browse_dest).pack(side="left", padx=5)
 
+        tk.Checkbutton(card, text="Skip duplicate files (same content)", variable=self.dedupe_var,
+                       fg=COLORS["dark"]["text_primary"], bg=COLORS["dark"]["bg_card"], selectcolor="#111",
+                       activebackground=COLORS["dark"]["bg_card"], activeforeground=COLORS["dark"]["text_primary"],
+                       font=("Consolas",11)).pack(anchor="w", padx=5, pady=(0,5))
+
         # Buttons
         btn_frame = tk.Frame(main_frame, bg=COLORS["dark"]["bg_primary"])
         btn_frame.pack(fill="x", pady=10)
@@ -182,6 +471,8 @@ class FileOrganizerGUI:
         self.progress_rect = self.progress_canvas.create_rectangle(0,0,0,25, fill=COLORS["dark"]["progress_gradient"][0], width=0)
         self.progress_value = 0
         self.progress_max = 100
+        self._last_drawn_width = 0
+        self._last_color = COLORS["dark"]["progress_gradient"][0]
 
         # Terminal
         terminal_frame = tk.Frame(main_frame, bg=COLORS["dark"]["terminal_bg"], bd=2, relief="sunken")
@@ -209,27 +500,41 @@ class FileOrganizerGUI:
     def _log(self, msg):
         self.log_area.configure(state="normal")
         self.log_area.insert("end", msg + "\n")
+        lines = int(self.log_area.index("end-1c").split(".")[0])
+        if lines > LOG_MAX_LINES:
+            self.log_area.delete("1.0", f"end - {LOG_MAX_LINES} lines")
         self.log_area.see("end")
         self.log_area.configure(state="disabled")
 
     # ---------- Gradient Progress Animation ----------
     def _animate_progress_gradient(self):
         gradient = COLORS["dark"]["progress_gradient"]
-        if self.progress_value > 0:
-            target_width = (self.progress_value/self.progress_max)*self.progress_canvas.winfo_width()
-            current_width = self.progress_canvas.coords(self.progress_rect)[2]
-            new_width = current_width + (target_width - current_width) * 0.2
+        active = self.worker is not None and self.worker.is_alive()
+        if self.progress_value == 0 and not active:
+            self.root.after(500, self._animate_progress_gradient)
+            return
+        target_width = (self.progress_value/max(self.progress_max, 1))*self.progress_canvas.winfo_width()
+        step = (target_width - self._last_drawn_width) * 0.2
+        new_width = self._last_drawn_width + step if abs(step) > 0.5 else target_width
+        redrawn = False
+        if abs(new_width - self._last_drawn_width) > 0.5:
             self.progress_canvas.coords(self.progress_rect, 0, 0, new_width, 25)
+            self._last_drawn_width = new_width
+            redrawn = True
+        if active:
             color = gradient[self.gradient_index % len(gradient)]
-            self.progress_canvas.itemconfig(self.progress_rect, fill=color)
             self.gradient_index += 1
-        self.root.after(80, self._animate_progress_gradient)
+            if color != self._last_color:
+                self.progress_canvas.itemconfig(self.progress_rect, fill=color)
+                self._last_color = color
+                redrawn = True
+        # Nothing moving and no worker: check back less often.
+        self.root.after(80 if redrawn or active else 500, self._animate_progress_gradient)
 
     # ---------- Terminal cursor ----------
     def _animate_terminal_cursor(self):
         self.log_area.configure(state="normal")
-        content = self.log_area.get("1.0", "end-1c")
-        if content.endswith("_"):
+        if self.log_area.get("end-2c", "end-1c") == "_":
             self.log_area.delete("end-2c")
         else:
             self.log_area.insert("end", "_")
@@ -260,9 +565,10 @@ class FileOrganizerGUI:
         self.organize_btn.config(state="disabled")
         self.cancel_btn.config(state="normal")
         self.progress_value = 0
-        self.progress_max = len([f for f in os.listdir(src) if os.path.isfile(os.path.join(src, f))])
-        self.worker = OrganizerWorker(src, dst, self.queue)
+        # progress_max is filled in from the worker's "start" message.
+        self.worker = OrganizerWorker(src, dst, self.queue, self.queue_event, dedupe=self.dedupe_var.get())
         self.worker.start()
+        self._schedule_poll()
         self._log("[SYS] Organization started...")
 
     def _on_cancel(self):
@@ -273,24 +579,46 @@ class FileOrganizerGUI:
             self._log("[SYS] No active operation to cancel.")
 
     # ---------- Queue ----------
+    def _schedule_poll(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(50, self._process_queue)
+
     def _process_queue(self):
-        try:
-            while True:
-                item = self.queue.get_nowait()
-                kind,payload = item
-                if kind=="progress":
+        self._polling = False
+        pending_logs = []
+        if self.queue_event.is_set():
+            self.queue_event.clear()
+            while self.queue:
+                kind,payload = self.queue.popleft()
+                if kind=="log":
+                    pending_logs.append(payload)
+                    continue
+                if pending_logs:
+                    self._log("\n".join(pending_logs))
+                    pending_logs = []
+                if kind=="start":
+                    # Sent once per phase (duplicate check, then moves).
+                    self.progress_max = payload
+                    self.progress_value = 0
+                elif kind=="progress":
                     self.progress_value = payload
-                elif kind=="log":
-                    self._log(payload)
+                elif kind=="error":
+                    self._log(f"[SYS] ERROR: {payload}")
+                    messagebox.showerror("Error", payload)
+                    self.organize_btn.config(state="normal")
+                    self.cancel_btn.config(state="disabled")
                 elif kind=="done":
                     self.progress_value = self.progress_max
                     self._log(f"[SYS] Completed! {payload} files organized.")
                     messagebox.showinfo("Success", f"{payload} files organized!")
                     self.organize_btn.config(state="normal")
                     self.cancel_btn.config(state="disabled")
-        except queue.Empty:
-            pass
-        self.root.after(100,self._process_queue)
+        if pending_logs:
+            self._log("\n".join(pending_logs))
+        # Only keep polling while there is a worker to listen to.
+        if (self.worker and self.worker.is_alive()) or self.queue:
+            self._schedule_poll()
 
 # ---------------- Entry ----------------
 if __name__=="__main__":
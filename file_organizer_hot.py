@@ -0,0 +1,31 @@
+"""
+file_organizer_hot.py
+Per-file helpers for the organizer's move loop, kept strictly typed so the
+module can be compiled in place with mypyc:
+
+    mypyc file_organizer_hot.py
+
+The compiled extension shadows this file on import; without it the pure
+Python version is used unchanged.
+"""
+
+import os
+from typing import Dict, Optional, Set
+
+
+def get_unique_name(name_set: Set[str], filename: str) -> str:
+    # name_set holds casefolded names so "Photo.jpg" can't claim "photo.jpg"
+    # on case-insensitive filesystems (NTFS, default APFS).
+    base, ext = os.path.splitext(filename)
+    candidate = filename
+    counter = 1
+    while candidate.casefold() in name_set:
+        candidate = f"{base} ({counter}){ext}"
+        counter += 1
+    name_set.add(candidate.casefold())
+    return candidate
+
+
+def categorize_file(filename: str, ext_to_cat: Dict[str, str]) -> Optional[str]:
+    ext = os.path.splitext(filename)[1]
+    return ext_to_cat.get(ext) or ext_to_cat.get(ext.lower())